@@ -2,18 +2,38 @@
 """Create a Gamma presentation from markdown content via the Gamma API."""
 
 import argparse
+import http.client
 import json
 import os
+import ssl
 import sys
 import time
 import urllib.request
 import urllib.error
 
-GAMMA_API_BASE = "https://gamma.app/api/v1"
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
+
+GAMMA_API_HOST = "gamma.app"
+GAMMA_API_PATH = "/api/v1"
+GAMMA_API_BASE = f"https://{GAMMA_API_HOST}{GAMMA_API_PATH}"
+
+_API_KEY = None
+_BASE_HEADERS = None
+
+# One TLS context (CA store loaded once) shared by every connection this script opens
+_SSL_CONTEXT = ssl.create_default_context()
+_OPENER = urllib.request.build_opener(urllib.request.HTTPSHandler(context=_SSL_CONTEXT))
 
 
 def get_api_key():
-    """Get Gamma API key from environment."""
+    """Get Gamma API key from environment (read once per process)."""
+    global _API_KEY
+    if _API_KEY:
+        return _API_KEY
+
     key = os.environ.get("GAMMA_API_KEY")
     if not key:
         print(json.dumps({
@@ -21,29 +41,81 @@ def get_api_key():
             "error": "GAMMA_API_KEY not set. Add it to your .env file. Get a key at gamma.app"
         }), file=sys.stderr)
         sys.exit(1)
+    _API_KEY = key
     return key
 
 
-def api_request(endpoint, data=None, method="POST"):
-    """Make an API request to Gamma."""
-    url = f"{GAMMA_API_BASE}/{endpoint}"
-    api_key = get_api_key()
+def get_headers():
+    """Request headers, built once and shared by every API call."""
+    global _BASE_HEADERS
+    if _BASE_HEADERS is None:
+        _BASE_HEADERS = {
+            "Authorization": f"Bearer {get_api_key()}",
+            "Content-Type": "application/json"
+        }
+    return _BASE_HEADERS
+
+
+def api_connection():
+    """Open a keep-alive HTTPS connection to the Gamma API host."""
+    return http.client.HTTPSConnection(GAMMA_API_HOST, timeout=120, context=_SSL_CONTEXT)
+
+
+# Errors raised when the server has closed a keep-alive socket while it sat idle
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
+
+def _conn_request(conn, method, path, body, headers):
+    """Send one request over a persistent connection, reconnecting once if the server dropped it."""
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        return conn.getresponse()
+    except _STALE_CONNECTION_ERRORS:
+        # Only GETs are safe to resend: a POST may already have been acted on
+        if method != "GET":
+            raise
+        conn.close()
+        conn.request(method, path, body=body, headers=headers)
+        return conn.getresponse()
+
+
+def api_request(endpoint, data=None, method="POST", conn=None):
+    """Make an API request to Gamma, optionally over a reused connection."""
+    url = f"{GAMMA_API_BASE}/{endpoint}"
+    headers = get_headers()
 
     if data:
-        body = json.dumps(data).encode("utf-8")
+        body = orjson.dumps(data) if orjson else json.dumps(data).encode("utf-8")
     else:
         body = None
 
+    if conn is not None:
+        try:
+            resp = _conn_request(conn, method, f"{GAMMA_API_PATH}/{endpoint}", body, headers)
+            raw = resp.read()
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            print(json.dumps({
+                "success": False,
+                "error": f"Network error: {str(e)}"
+            }), file=sys.stderr)
+            sys.exit(1)
+
+        if resp.status >= 400:
+            print(json.dumps({
+                "success": False,
+                "error": f"Gamma API error {resp.status}: {raw.decode('utf-8', 'replace')}"
+            }), file=sys.stderr)
+            sys.exit(1)
+
+        return orjson.loads(raw) if orjson else json.loads(raw)
+
     req = urllib.request.Request(url, data=body, headers=headers, method=method)
 
     try:
-        with urllib.request.urlopen(req, timeout=120) as resp:
-            return json.loads(resp.read().decode("utf-8"))
+        with _OPENER.open(req, timeout=120) as resp:
+            raw = resp.read()
+            return orjson.loads(raw) if orjson else json.loads(raw)
     except urllib.error.HTTPError as e:
         error_body = e.read().decode("utf-8") if e.fp else str(e)
         print(json.dumps({
@@ -80,31 +152,36 @@ def create_presentation(content: str, title: str = None):
         }), file=sys.stderr)
         sys.exit(1)
 
-    # Poll for completion
+    # Poll for completion with exponential backoff over one keep-alive connection
     max_wait = 120  # seconds
-    poll_interval = 5  # seconds
-    elapsed = 0
-
-    while elapsed < max_wait:
-        status = api_request(f"presentations/{presentation_id}", method="GET")
-        state = status.get("status", "unknown")
-
-        if state == "completed":
-            return {
-                "success": True,
-                "id": presentation_id,
-                "url": status.get("url", f"https://gamma.app/docs/{presentation_id}"),
-                "title": status.get("title", title or "Untitled"),
-                "slides": status.get("slide_count", "unknown")
-            }
-        elif state == "failed":
-            return {
-                "success": False,
-                "error": f"Presentation generation failed: {status.get('error', 'unknown')}"
-            }
+    interval = 1.0  # seconds, grows to max_interval
+    max_interval = 10.0
+    deadline = time.monotonic() + max_wait
+    conn = api_connection()
 
-        time.sleep(poll_interval)
-        elapsed += poll_interval
+    try:
+        while time.monotonic() < deadline:
+            status = api_request(f"presentations/{presentation_id}", method="GET", conn=conn)
+            state = status.get("status", "unknown")
+
+            if state == "completed":
+                return {
+                    "success": True,
+                    "id": presentation_id,
+                    "url": status.get("url", f"https://gamma.app/docs/{presentation_id}"),
+                    "title": status.get("title", title or "Untitled"),
+                    "slides": status.get("slide_count", "unknown")
+                }
+            elif state == "failed":
+                return {
+                    "success": False,
+                    "error": f"Presentation generation failed: {status.get('error', 'unknown')}"
+                }
+
+            time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+            interval = min(interval * 1.6, max_interval)
+    finally:
+        conn.close()
 
     return {
         "success": False,
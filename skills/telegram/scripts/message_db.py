@@ -6,15 +6,24 @@ Usage:
     python .claude/skills/telegram/scripts/message_db.py --action history --chat-id 123 --limit 20
     python .claude/skills/telegram/scripts/message_db.py --action stats
     python .claude/skills/telegram/scripts/message_db.py --action recent --hours 24
+    python .claude/skills/telegram/scripts/message_db.py --action recent --hours 720 --ndjson
 """
 
 import sys
 import json
+import atexit
 import sqlite3
 import argparse
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
+
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
 
 # ---------------------------------------------------------------------------
 # Paths
@@ -32,10 +41,23 @@ PROJECT_ROOT = _find_project_root()
 DB_PATH = PROJECT_ROOT / "data" / "messages.db"
 
 
-def get_connection():
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+_CONN: Optional[sqlite3.Connection] = None
+_SCHEMA_READY = False
+
+# The connection is shared across threads (the Telegram handler logs from a
+# background pool); writes take this lock so transactions never interleave.
+_WRITE_LOCK = threading.RLock()
+
+# Long-running processes refresh planner statistics every N inserted messages
+OPTIMIZE_EVERY = 10000
+_writes_since_optimize = 0
+
+
+def _init_db(conn: sqlite3.Connection):
+    """Create tables and indexes. Runs once per process."""
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
 
     cursor = conn.cursor()
 
@@ -53,6 +75,7 @@ def get_connection():
             reply_to_id INTEGER,
             metadata TEXT,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            created_at_ts INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
             processed_at DATETIME,
             status TEXT DEFAULT 'received' CHECK(status IN ('received', 'processing', 'processed', 'failed', 'rejected'))
         )
@@ -73,13 +96,151 @@ def get_connection():
         )
     """)
 
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_messages_chat ON messages(platform, chat_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_messages_created ON messages(created_at)")
+    # Databases created before created_at_ts existed: ALTER TABLE cannot add a
+    # column with an expression default, so backfill it and fill new rows by trigger.
+    columns = {row["name"] for row in cursor.execute("PRAGMA table_info(messages)")}
+    if "created_at_ts" not in columns:
+        cursor.execute("ALTER TABLE messages ADD COLUMN created_at_ts INTEGER")
+        cursor.execute("UPDATE messages SET created_at_ts = CAST(strftime('%s', created_at) AS INTEGER)")
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_msg_created_ts AFTER INSERT ON messages
+            WHEN NEW.created_at_ts IS NULL
+            BEGIN
+                UPDATE messages SET created_at_ts = CAST(strftime('%s', NEW.created_at) AS INTEGER)
+                WHERE id = NEW.id;
+            END
+        """)
+
+    # (platform, chat_id, created_at, id) serves get_history's ORDER BY, including the
+    # id tiebreak for same-second rows, without a sort step. It supersedes the old
+    # (platform, chat_id) and (platform, chat_id, created_at) indexes.
+    cursor.execute("DROP INDEX IF EXISTS idx_messages_chat")
+    cursor.execute("DROP INDEX IF EXISTS idx_messages_chat_time")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_messages_chat_time_id"
+        " ON messages(platform, chat_id, created_at DESC, id DESC)"
+    )
+    # get_recent filters on the integer epoch column
+    cursor.execute("DROP INDEX IF EXISTS idx_messages_created")
+    cursor.execute("DROP INDEX IF EXISTS idx_messages_platform_time")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_messages_ts ON messages(created_at_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_messages_platform_ts ON messages(platform, created_at_ts DESC)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_messages_status ON messages(status)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_conversations_chat ON conversations(platform, chat_id)")
 
+    # Running totals for get_stats, maintained by trigger so stats never scan messages.
+    # Keys: 'total', 'plat:<platform>', 'dir:<direction>', 'day:<YYYY-MM-DD>'.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS message_counters (
+            key TEXT PRIMARY KEY,
+            value INTEGER DEFAULT 0
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_msg_count AFTER INSERT ON messages
+        BEGIN
+            INSERT INTO message_counters (key, value) VALUES ('total', 1)
+                ON CONFLICT(key) DO UPDATE SET value = value + 1;
+            INSERT INTO message_counters (key, value) VALUES ('plat:' || NEW.platform, 1)
+                ON CONFLICT(key) DO UPDATE SET value = value + 1;
+            INSERT INTO message_counters (key, value) VALUES ('dir:' || NEW.direction, 1)
+                ON CONFLICT(key) DO UPDATE SET value = value + 1;
+            INSERT INTO message_counters (key, value) VALUES ('day:' || date(NEW.created_at), 1)
+                ON CONFLICT(key) DO UPDATE SET value = value + 1;
+        END
+    """)
+
+    # Databases created before the counters existed: seed them once from messages
+    if cursor.execute("SELECT 1 FROM message_counters LIMIT 1").fetchone() is None:
+        cursor.execute("""
+            INSERT INTO message_counters (key, value)
+            SELECT 'total', COUNT(*) FROM messages
+            UNION ALL SELECT 'plat:' || platform, COUNT(*) FROM messages GROUP BY platform
+            UNION ALL SELECT 'dir:' || direction, COUNT(*) FROM messages GROUP BY direction
+            UNION ALL SELECT 'day:' || date(created_at), COUNT(*) FROM messages GROUP BY date(created_at)
+        """)
+
     conn.commit()
-    return conn
+
+    # Give the planner row-count statistics for the compound indexes on first run
+    if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is None:
+        cursor.execute("ANALYZE")
+
+    _SCHEMA_READY = True
+
+
+def get_connection() -> sqlite3.Connection:
+    """Return the process-wide connection, opening it (WAL mode) on first use."""
+    global _CONN
+    if _CONN is not None:
+        return _CONN
+
+    with _WRITE_LOCK:
+        if _CONN is not None:
+            return _CONN
+
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
+
+        _init_db(conn)
+        _CONN = conn
+        return conn
+
+
+def _close_connection():
+    global _CONN
+    if _CONN is not None:
+        _CONN.execute("PRAGMA optimize")
+        _CONN.close()
+        _CONN = None
+
+
+def _note_writes(conn: sqlite3.Connection, count: int):
+    global _writes_since_optimize
+    _writes_since_optimize += count
+    if _writes_since_optimize >= OPTIMIZE_EVERY:
+        conn.execute("PRAGMA optimize")
+        _writes_since_optimize = 0
+
+
+atexit.register(_close_connection)
+
+
+def _dumps(obj) -> str:
+    if orjson:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _print_json(result: Dict[str, Any]):
+    if orjson:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(
+            orjson.dumps(result, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        )
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(result, indent=2, default=str))
+
+
+def _write_ndjson(rows: Iterator[Dict]):
+    """Stream rows to stdout as newline-delimited JSON."""
+    if orjson:
+        out = sys.stdout.buffer
+        for row in rows:
+            out.write(orjson.dumps(row, default=str, option=orjson.OPT_APPEND_NEWLINE))
+        out.flush()
+    else:
+        for row in rows:
+            print(json.dumps(row, default=str))
 
 
 def row_to_dict(row) -> Optional[Dict]:
@@ -88,6 +249,16 @@ def row_to_dict(row) -> Optional[Dict]:
     return dict(row)
 
 
+def _iter_dicts(conn: sqlite3.Connection, sql: str, params) -> Iterator[Dict]:
+    """Run a query and yield plain dicts, resolving column names once per query."""
+    cursor = conn.cursor()
+    cursor.row_factory = None  # plain tuples; skip building sqlite3.Row objects
+    cursor.execute(sql, params)
+    columns = [col[0] for col in cursor.description]
+    for row in cursor:
+        yield dict(zip(columns, row))
+
+
 def log_message(
     platform: str,
     direction: str,
@@ -101,38 +272,37 @@ def log_message(
     status: str = "received",
 ) -> Dict[str, Any]:
     conn = get_connection()
-    cursor = conn.cursor()
-
-    metadata_json = json.dumps(metadata) if metadata else None
-
-    cursor.execute(
-        """
-        INSERT INTO messages
-        (platform, direction, chat_id, user_id, username, content, message_type,
-         external_message_id, metadata, status)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """,
-        (
-            platform, direction, chat_id, user_id, username, content,
-            message_type, external_message_id, metadata_json, status,
-        ),
-    )
-
-    message_id = cursor.lastrowid
-
-    cursor.execute(
-        """
-        INSERT INTO conversations (platform, chat_id, first_message_at, last_message_at, message_count)
-        VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 1)
-        ON CONFLICT(chat_id) DO UPDATE SET
-            last_message_at = CURRENT_TIMESTAMP,
-            message_count = message_count + 1
-    """,
-        (platform, chat_id),
-    )
-
-    conn.commit()
-    conn.close()
+    metadata_json = _dumps(metadata) if metadata else None
+
+    with _WRITE_LOCK:
+        with conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO messages
+                (platform, direction, chat_id, user_id, username, content, message_type,
+                 external_message_id, metadata, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    platform, direction, chat_id, user_id, username, content,
+                    message_type, external_message_id, metadata_json, status,
+                ),
+            )
+
+            message_id = cursor.lastrowid
+
+            conn.execute(
+                """
+                INSERT INTO conversations (platform, chat_id, first_message_at, last_message_at, message_count)
+                VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 1)
+                ON CONFLICT(chat_id) DO UPDATE SET
+                    last_message_at = CURRENT_TIMESTAMP,
+                    message_count = message_count + 1
+            """,
+                (platform, chat_id),
+            )
+
+        _note_writes(conn, 1)
 
     return {
         "success": True,
@@ -143,32 +313,39 @@ def log_message(
     }
 
 
-def get_history(
+def iter_history(
     chat_id: str,
     platform: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
-) -> Dict[str, Any]:
+) -> Iterator[Dict]:
+    """Yield a chat's messages newest-first, one row resident at a time."""
     conn = get_connection()
-    cursor = conn.cursor()
 
     if platform:
-        cursor.execute(
-            "SELECT * FROM messages WHERE chat_id = ? AND platform = ? ORDER BY created_at DESC LIMIT ? OFFSET ?",
+        yield from _iter_dicts(
+            conn,
+            "SELECT * FROM messages WHERE chat_id = ? AND platform = ? ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
             (chat_id, platform, limit, offset),
         )
     else:
-        cursor.execute(
-            "SELECT * FROM messages WHERE chat_id = ? ORDER BY created_at DESC LIMIT ? OFFSET ?",
+        yield from _iter_dicts(
+            conn,
+            "SELECT * FROM messages WHERE chat_id = ? ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
             (chat_id, limit, offset),
         )
 
-    messages = [row_to_dict(row) for row in cursor.fetchall()]
 
-    cursor.execute("SELECT * FROM conversations WHERE chat_id = ?", (chat_id,))
-    conversation = row_to_dict(cursor.fetchone())
+def get_history(
+    chat_id: str,
+    platform: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    messages = list(iter_history(chat_id, platform=platform, limit=limit, offset=offset))
 
-    conn.close()
+    cursor = get_connection().execute("SELECT * FROM conversations WHERE chat_id = ?", (chat_id,))
+    conversation = row_to_dict(cursor.fetchone())
 
     return {
         "success": True,
@@ -179,25 +356,28 @@ def get_history(
     }
 
 
-def get_recent(hours: int = 24, platform: Optional[str] = None) -> Dict[str, Any]:
+def iter_recent(hours: int = 24, platform: Optional[str] = None) -> Iterator[Dict]:
+    """Yield messages from the last N hours newest-first, one row resident at a time."""
     conn = get_connection()
-    cursor = conn.cursor()
 
-    cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+    cutoff = int(time.time()) - hours * 3600
 
     if platform:
-        cursor.execute(
-            "SELECT * FROM messages WHERE created_at >= ? AND platform = ? ORDER BY created_at DESC",
+        yield from _iter_dicts(
+            conn,
+            "SELECT * FROM messages WHERE created_at_ts >= ? AND platform = ? ORDER BY created_at_ts DESC",
             (cutoff, platform),
         )
     else:
-        cursor.execute(
-            "SELECT * FROM messages WHERE created_at >= ? ORDER BY created_at DESC",
+        yield from _iter_dicts(
+            conn,
+            "SELECT * FROM messages WHERE created_at_ts >= ? ORDER BY created_at_ts DESC",
             (cutoff,),
         )
 
-    messages = [row_to_dict(row) for row in cursor.fetchall()]
-    conn.close()
+
+def get_recent(hours: int = 24, platform: Optional[str] = None) -> Dict[str, Any]:
+    messages = list(iter_recent(hours=hours, platform=platform))
 
     return {"success": True, "hours": hours, "messages": messages, "count": len(messages)}
 
@@ -206,24 +386,31 @@ def get_stats() -> Dict[str, Any]:
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute("SELECT COUNT(*) as total FROM messages")
-    total = cursor.fetchone()["total"]
-
-    cursor.execute("SELECT platform, COUNT(*) as count FROM messages GROUP BY platform")
-    by_platform = {row["platform"]: row["count"] for row in cursor.fetchall()}
+    today = datetime.now().date().isoformat()
+    cursor.execute(
+        "SELECT key, value FROM message_counters"
+        " WHERE key = 'total' OR key LIKE 'plat:%' OR key LIKE 'dir:%' OR key = ?",
+        ("day:" + today,),
+    )
 
-    cursor.execute("SELECT direction, COUNT(*) as count FROM messages GROUP BY direction")
-    by_direction = {row["direction"]: row["count"] for row in cursor.fetchall()}
+    total = 0
+    today_count = 0
+    by_platform = {}
+    by_direction = {}
+    for row in cursor.fetchall():
+        key, value = row["key"], row["value"]
+        if key == "total":
+            total = value
+        elif key.startswith("plat:"):
+            by_platform[key[5:]] = value
+        elif key.startswith("dir:"):
+            by_direction[key[4:]] = value
+        else:
+            today_count = value
 
     cursor.execute("SELECT COUNT(*) as count FROM conversations WHERE is_active = 1")
     active_conversations = cursor.fetchone()["count"]
 
-    today = datetime.now().date().isoformat()
-    cursor.execute("SELECT COUNT(*) as count FROM messages WHERE date(created_at) = ?", (today,))
-    today_count = cursor.fetchone()["count"]
-
-    conn.close()
-
     return {
         "success": True,
         "stats": {
@@ -242,20 +429,16 @@ def update_status(message_id: int, status: str) -> Dict[str, Any]:
         return {"success": False, "error": f"Invalid status. Must be one of: {valid_statuses}"}
 
     conn = get_connection()
-    cursor = conn.cursor()
 
-    cursor.execute(
-        "UPDATE messages SET status = ?, processed_at = CURRENT_TIMESTAMP WHERE id = ?",
-        (status, message_id),
-    )
+    with _WRITE_LOCK, conn:
+        cursor = conn.execute(
+            "UPDATE messages SET status = ?, processed_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (status, message_id),
+        )
 
     if cursor.rowcount == 0:
-        conn.close()
         return {"success": False, "error": f"Message {message_id} not found"}
 
-    conn.commit()
-    conn.close()
-
     return {"success": True, "message_id": message_id, "status": status}
 
 
@@ -263,7 +446,6 @@ def get_conversations(
     platform: Optional[str] = None, active_only: bool = True, limit: int = 50
 ) -> Dict[str, Any]:
     conn = get_connection()
-    cursor = conn.cursor()
 
     conditions = []
     params = []
@@ -277,13 +459,11 @@ def get_conversations(
 
     where = " AND ".join(conditions) if conditions else "1=1"
 
-    cursor.execute(
+    conversations = list(_iter_dicts(
+        conn,
         f"SELECT * FROM conversations WHERE {where} ORDER BY last_message_at DESC LIMIT ?",
         params + [limit],
-    )
-
-    conversations = [row_to_dict(row) for row in cursor.fetchall()]
-    conn.close()
+    ))
 
     return {"success": True, "conversations": conversations, "count": len(conversations)}
 
@@ -305,6 +485,7 @@ def main():
     parser.add_argument("--hours", type=int, default=24)
     parser.add_argument("--limit", type=int, default=50)
     parser.add_argument("--offset", type=int, default=0)
+    parser.add_argument("--ndjson", action="store_true", help="Stream history/recent rows as NDJSON")
 
     args = parser.parse_args()
     result = None
@@ -322,8 +503,14 @@ def main():
         if not args.chat_id:
             print("Error: --chat-id required for history")
             sys.exit(1)
+        if args.ndjson:
+            _write_ndjson(iter_history(chat_id=args.chat_id, platform=args.platform, limit=args.limit, offset=args.offset))
+            return
         result = get_history(chat_id=args.chat_id, platform=args.platform, limit=args.limit, offset=args.offset)
     elif args.action == "recent":
+        if args.ndjson:
+            _write_ndjson(iter_recent(hours=args.hours, platform=args.platform))
+            return
         result = get_recent(hours=args.hours, platform=args.platform)
     elif args.action == "stats":
         result = get_stats()
@@ -341,7 +528,7 @@ def main():
         else:
             print(f"ERROR {result.get('error')}")
             sys.exit(1)
-        print(json.dumps(result, indent=2, default=str))
+        _print_json(result)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,238 @@
+"""
+Semantic Cache — reuse Claude responses for near-duplicate questions.
+
+Stores (embedding, query, response) per chat in SQLite. A new question whose
+embedding is within SIMILARITY_THRESHOLD (cosine) of a fresh entry is answered
+from the cache instead of spawning Claude. Only question-shaped messages are
+cached, and entries expire after an hour.
+
+Usage:
+    python .claude/skills/telegram/scripts/semantic_cache.py --action stats
+    python .claude/skills/telegram/scripts/semantic_cache.py --action lookup --chat-id 123 --query "What does X do?"
+    python .claude/skills/telegram/scripts/semantic_cache.py --action purge
+
+Env Vars:
+    OPENAI_API_KEY (for query embeddings)
+"""
+
+import re
+import sys
+import json
+import array
+import atexit
+import sqlite3
+import argparse
+import functools
+import math
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+
+def _find_project_root():
+    path = Path(__file__).resolve().parent
+    while path != path.parent:
+        if (path / ".env").exists() or (path / "CLAUDE.md").exists():
+            return path
+        path = path.parent
+    raise RuntimeError("Could not find project root")
+
+PROJECT_ROOT = _find_project_root()
+DB_PATH = PROJECT_ROOT / "data" / "semantic_cache.db"
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+SIMILARITY_THRESHOLD = 0.87
+CACHE_TTL = 3600  # seconds; short, since answers aren't tied to a conversation turn
+PURGE_INTERVAL = 3600  # Drop expired rows from store() at most this often
+
+# Default-deny: only questions are cached. Anything else may be a work request
+# ("fix the failing test", "go ahead") and must always reach Claude.
+_QUESTION_RE = re.compile(
+    r"^\s*(what|why|how|when|where|who|which|explain|describe|define|summari[sz]e)\b",
+    re.IGNORECASE,
+)
+
+# Questions that still ask for something to be done ("can you deploy ...?")
+_SIDE_EFFECT_RE = re.compile(
+    r"\b(run|execute|commit|push|deploy|send|delete|remove|create|write|install|update|restart|"
+    r"fix|add|change|edit|refactor|rename|move|implement|build|generate|make)\b",
+    re.IGNORECASE,
+)
+
+_CONN: Optional[sqlite3.Connection] = None
+_last_purge = 0.0
+
+
+def get_connection() -> sqlite3.Connection:
+    global _CONN
+    if _CONN is not None:
+        return _CONN
+
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS semantic_cache (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chat_id TEXT NOT NULL,
+            query TEXT NOT NULL,
+            response TEXT NOT NULL,
+            embedding BLOB NOT NULL,
+            created_at_ts INTEGER NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_semantic_cache_chat ON semantic_cache(chat_id, created_at_ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_semantic_cache_ts ON semantic_cache(created_at_ts)")
+    conn.commit()
+
+    _CONN = conn
+    return conn
+
+
+def _close_connection():
+    global _CONN
+    if _CONN is not None:
+        _CONN.close()
+        _CONN = None
+
+
+atexit.register(_close_connection)
+
+
+def is_cacheable(text: str) -> bool:
+    """True only for plain questions; anything that may ask for work is never cached."""
+    text = text.strip()
+    if not (text.endswith("?") or _QUESTION_RE.match(text)):
+        return False
+    return not _SIDE_EFFECT_RE.search(text)
+
+
+@functools.lru_cache(maxsize=1)
+def _openai_client():
+    from openai import OpenAI
+    return OpenAI()
+
+
+def embed(text: str) -> Optional[List[float]]:
+    """Unit-normalized embedding of text, or None if embeddings are unavailable."""
+    try:
+        response = _openai_client().embeddings.create(model=EMBEDDING_MODEL, input=text)
+        vector = response.data[0].embedding
+    except Exception as e:
+        print(f"Warning: Embedding failed, semantic cache skipped: {e}")
+        return None
+
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def lookup(chat_id: str, embedding: List[float], threshold: float = SIMILARITY_THRESHOLD) -> Optional[Dict[str, Any]]:
+    """Best fresh entry for this chat with cosine similarity >= threshold."""
+    conn = get_connection()
+    cutoff = int(time.time()) - CACHE_TTL
+
+    best = None
+    best_score = threshold
+    for row in conn.execute(
+        "SELECT id, query, response, embedding FROM semantic_cache WHERE chat_id = ? AND created_at_ts >= ?",
+        (chat_id, cutoff),
+    ):
+        cached = array.array("f", row["embedding"])
+        if len(cached) != len(embedding):
+            continue
+        # Both vectors are unit-length, so the dot product is the cosine similarity
+        score = sum(a * b for a, b in zip(embedding, cached))
+        if score >= best_score:
+            best, best_score = row, score
+
+    if best is None:
+        return None
+
+    return {"id": best["id"], "query": best["query"], "response": best["response"], "similarity": best_score}
+
+
+def store(chat_id: str, query: str, embedding: List[float], response: str) -> Dict[str, Any]:
+    global _last_purge
+    conn = get_connection()
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO semantic_cache (chat_id, query, response, embedding, created_at_ts) VALUES (?, ?, ?, ?, ?)",
+            (chat_id, query, response, array.array("f", embedding).tobytes(), int(time.time())),
+        )
+
+    # Expired rows are never served; drop them now and then so the table stays bounded
+    if time.time() - _last_purge >= PURGE_INTERVAL:
+        _last_purge = time.time()
+        purge_expired()
+
+    return {"success": True, "id": cursor.lastrowid}
+
+
+def purge_expired() -> Dict[str, Any]:
+    conn = get_connection()
+    with conn:
+        cursor = conn.execute(
+            "DELETE FROM semantic_cache WHERE created_at_ts < ?", (int(time.time()) - CACHE_TTL,)
+        )
+    return {"success": True, "deleted": cursor.rowcount}
+
+
+def get_stats() -> Dict[str, Any]:
+    conn = get_connection()
+    cutoff = int(time.time()) - CACHE_TTL
+    row = conn.execute(
+        "SELECT COUNT(*) AS total, SUM(created_at_ts >= ?) AS fresh, COUNT(DISTINCT chat_id) AS chats FROM semantic_cache",
+        (cutoff,),
+    ).fetchone()
+    return {
+        "success": True,
+        "stats": {"entries": row["total"], "fresh": row["fresh"] or 0, "chats": row["chats"]},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semantic response cache")
+    parser.add_argument("--action", required=True, choices=["stats", "lookup", "purge"])
+    parser.add_argument("--chat-id")
+    parser.add_argument("--query")
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD)
+
+    args = parser.parse_args()
+    result = None
+
+    if args.action == "stats":
+        result = get_stats()
+    elif args.action == "purge":
+        result = purge_expired()
+    elif args.action == "lookup":
+        if not args.chat_id or not args.query:
+            print("Error: --chat-id and --query required for lookup")
+            sys.exit(1)
+        embedding = embed(args.query)
+        if embedding is None:
+            result = {"success": False, "error": "Could not embed query"}
+        else:
+            hit = lookup(args.chat_id, embedding, threshold=args.threshold)
+            result = {"success": True, "hit": hit is not None, "entry": hit}
+
+    if result:
+        if result.get("success"):
+            print("OK")
+        else:
+            print(f"ERROR {result.get('error')}")
+            sys.exit(1)
+        print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
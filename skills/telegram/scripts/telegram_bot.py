@@ -13,13 +13,14 @@ Env Vars:
 import sys
 import json
 import argparse
+import functools
+import re
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
-from collections import defaultdict
+from typing import Optional, Dict, Any, List, Tuple, Pattern
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-import yaml
 
 # ---------------------------------------------------------------------------
 # Paths
@@ -38,23 +39,48 @@ load_dotenv(PROJECT_ROOT / ".env")
 
 # Import sibling modules
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from telegram_send import telegram_api_call, send_message, get_bot_token, log_message
+from telegram_send import (
+    telegram_api_call, send_message, get_bot_token, log_message, log_messages, load_config,
+)
 
-CONFIG_PATH = Path(__file__).resolve().parent.parent / "references" / "messaging.yaml"
+# Rate limiting storage (in-memory): user_id -> (minute_tokens, hour_tokens, last_refill)
+rate_limits: Dict[int, Tuple[float, float, float]] = {}
+RATE_LIMIT_GC_THRESHOLD = 10000
 
-# Rate limiting storage (in-memory)
-rate_limits = defaultdict(list)
+# Upper bound on concurrent rejection replies sent for one getUpdates batch
+MAX_REPLY_WORKERS = 8
 
 
-def load_config() -> Dict[str, Any]:
-    if CONFIG_PATH.exists():
-        with open(CONFIG_PATH) as f:
-            return yaml.safe_load(f)
-    return {}
+@functools.lru_cache(maxsize=8)
+def _compile_matcher(needles: Tuple[Tuple[str, str], ...]) -> Tuple[Optional[Pattern], Dict[str, str]]:
+    """
+    Build one regex alternation over lowercased needles so text is scanned once.
+    needles is ((needle, reported_value), ...); returns (pattern, needle -> value).
+    """
+    lookup = {}
+    for needle, value in needles:
+        lookup.setdefault(needle.lower(), value)
 
+    if not lookup:
+        return None, lookup
 
-def is_user_allowed(user_id: int, username: Optional[str] = None) -> bool:
-    config = load_config()
+    # Longest first so overlapping needles report the most specific match
+    alternation = "|".join(re.escape(n) for n in sorted(lookup, key=len, reverse=True))
+    return re.compile(alternation), lookup
+
+
+def _first_match(needles: Tuple[Tuple[str, str], ...], text_lower: str) -> Optional[str]:
+    pattern, lookup = _compile_matcher(needles)
+    if pattern is None:
+        return None
+    match = pattern.search(text_lower)
+    return lookup[match.group(0)] if match else None
+
+
+def is_user_allowed(
+    user_id: int, username: Optional[str] = None, config: Optional[Dict[str, Any]] = None
+) -> bool:
+    config = config if config is not None else load_config()
     telegram_config = config.get("telegram", {})
 
     allowed_ids = telegram_config.get("allowed_user_ids", [])
@@ -73,51 +99,65 @@ def is_user_allowed(user_id: int, username: Optional[str] = None) -> bool:
     return False
 
 
-def is_rate_limited(user_id: int) -> bool:
-    config = load_config()
+def is_rate_limited(user_id: int, config: Optional[Dict[str, Any]] = None) -> bool:
+    config = config if config is not None else load_config()
     security = config.get("security", {})
 
     max_per_minute = security.get("max_messages_per_minute", 30)
     max_per_hour = security.get("max_messages_per_hour", 200)
 
-    now = datetime.now()
-    minute_ago = now - timedelta(minutes=1)
-    hour_ago = now - timedelta(hours=1)
+    # Two token buckets per user, refilled continuously: O(1) per check
+    now = time.monotonic()
+    bucket = rate_limits.get(user_id)
 
-    rate_limits[user_id] = [t for t in rate_limits[user_id] if t > hour_ago]
-
-    recent_minute = sum(1 for t in rate_limits[user_id] if t > minute_ago)
-    recent_hour = len(rate_limits[user_id])
+    if bucket is None:
+        minute_tokens, hour_tokens = float(max_per_minute), float(max_per_hour)
+    else:
+        minute_tokens, hour_tokens, last_refill = bucket
+        elapsed = now - last_refill
+        minute_tokens = min(max_per_minute, minute_tokens + elapsed * max_per_minute / 60.0)
+        hour_tokens = min(max_per_hour, hour_tokens + elapsed * max_per_hour / 3600.0)
 
-    if recent_minute >= max_per_minute or recent_hour >= max_per_hour:
+    if minute_tokens < 1 or hour_tokens < 1:
+        rate_limits[user_id] = (minute_tokens, hour_tokens, now)
         return True
 
-    rate_limits[user_id].append(now)
+    rate_limits[user_id] = (minute_tokens - 1, hour_tokens - 1, now)
+
+    if len(rate_limits) > RATE_LIMIT_GC_THRESHOLD:
+        _gc_rate_limits(now, max_per_minute, max_per_hour)
+
     return False
 
 
-def is_blocked_content(text: str) -> Optional[str]:
-    config = load_config()
-    blocked = config.get("security", {}).get("blocked_patterns", [])
+def _gc_rate_limits(now: float, max_per_minute: int, max_per_hour: int):
+    """Drop buckets that have refilled completely — they behave like new users."""
+    for user_id, (minute_tokens, hour_tokens, last_refill) in list(rate_limits.items()):
+        elapsed = now - last_refill
+        if (
+            minute_tokens + elapsed * max_per_minute / 60.0 >= max_per_minute
+            and hour_tokens + elapsed * max_per_hour / 3600.0 >= max_per_hour
+        ):
+            del rate_limits[user_id]
 
-    for pattern in blocked:
-        if pattern.lower() in text.lower():
-            return pattern
 
-    return None
+def is_blocked_content(text: str, config: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    config = config if config is not None else load_config()
+    blocked = config.get("security", {}).get("blocked_patterns", [])
 
+    return _first_match(tuple((p, p) for p in blocked), text.lower())
 
-def requires_confirmation(text: str) -> Optional[str]:
-    config = load_config()
-    confirm_ops = config.get("security", {}).get("require_confirmation", [])
 
-    text_lower = text.lower()
+def requires_confirmation(text: str, config: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    config = config if config is not None else load_config()
+    confirm_ops = config.get("security", {}).get("require_confirmation", [])
 
+    needles = []
     for op in confirm_ops:
-        if op.lower().replace("_", " ") in text_lower or op.lower() in text_lower:
-            return op
+        needles.append((op.replace("_", " "), op))
+        needles.append((op, op))
 
-    return None
+    return _first_match(tuple(needles), text.lower())
 
 
 def get_updates(offset: Optional[int] = None, timeout: int = 30) -> Dict[str, Any]:
@@ -128,10 +168,39 @@ def get_updates(offset: Optional[int] = None, timeout: int = 30) -> Dict[str, An
     if offset:
         data["offset"] = offset
 
-    return telegram_api_call("getUpdates", data)
+    # Telegram holds the request open for up to `timeout` seconds — the HTTP
+    # client must wait longer than that or it gives up before the server does.
+    return telegram_api_call("getUpdates", data, timeout=timeout + 10)
 
 
-def process_message(message: Dict) -> Dict[str, Any]:
+def ack_updates(offset: int) -> Dict[str, Any]:
+    """Confirm every update below offset so Telegram stops redelivering it."""
+    return telegram_api_call("getUpdates", {"offset": offset, "limit": 1, "timeout": 0}, timeout=10)
+
+
+def _reply(chat_id: int, text: str, outbox: Optional[List[Tuple[int, str]]] = None):
+    if outbox is None:
+        send_message(chat_id, text)
+    else:
+        outbox.append((chat_id, text))
+
+
+def _send_replies(outbox: List[Tuple[int, str]]):
+    """Send queued replies concurrently so their round trips overlap."""
+    if len(outbox) <= 1:
+        for chat_id, text in outbox:
+            send_message(chat_id, text)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(len(outbox), MAX_REPLY_WORKERS)) as executor:
+        list(executor.map(lambda reply: send_message(*reply), outbox))
+
+
+def process_message(
+    message: Dict,
+    log_entries: Optional[List[Tuple]] = None,
+    outbox: Optional[List[Tuple[int, str]]] = None,
+) -> Dict[str, Any]:
     chat_id = message.get("chat", {}).get("id")
     user = message.get("from", {})
     user_id = user.get("id")
@@ -149,39 +218,46 @@ def process_message(message: Dict) -> Dict[str, Any]:
         "response": None,
     }
 
-    log_message(chat_id, "IN", text)
+    # Callers processing a batch pass log_entries/outbox to coalesce writes and sends
+    if log_entries is None:
+        log_message(chat_id, "IN", text)
+    else:
+        log_entries.append((chat_id, "IN", text))
 
-    if not is_user_allowed(user_id, username):
+    # One config lookup shared by all the checks below
+    config = load_config()
+
+    if not is_user_allowed(user_id, username, config):
         result["rejected"] = "not_whitelisted"
         result["response"] = "Unauthorized. Your user ID is not in the whitelist."
-        send_message(chat_id, result["response"])
+        _reply(chat_id, result["response"], outbox)
         return result
 
-    if is_rate_limited(user_id):
+    if is_rate_limited(user_id, config):
         result["rejected"] = "rate_limited"
         result["response"] = "Rate limit exceeded. Please wait before sending more messages."
-        send_message(chat_id, result["response"])
+        _reply(chat_id, result["response"], outbox)
         return result
 
-    blocked = is_blocked_content(text)
+    blocked = is_blocked_content(text, config)
     if blocked:
         result["rejected"] = "blocked_content"
         result["response"] = f"Message blocked: contains prohibited pattern '{blocked}'"
-        send_message(chat_id, result["response"])
+        _reply(chat_id, result["response"], outbox)
         return result
 
-    confirm = requires_confirmation(text)
+    confirm = requires_confirmation(text, config)
     if confirm:
         result["requires_confirmation"] = confirm
         result["response"] = f"This action ({confirm}) requires confirmation. Reply 'CONFIRM' to proceed."
-        send_message(chat_id, result["response"])
+        _reply(chat_id, result["response"], outbox)
         return result
 
     result["processed"] = True
 
-    if text.startswith("/"):
+    if text[:1] == "/":
         result["is_command"] = True
-        result["command"] = text.split()[0][1:]
+        result["command"] = text.split(maxsplit=1)[0][1:]
 
     return result
 
@@ -215,14 +291,16 @@ def process_callback_query(callback: Dict) -> Dict[str, Any]:
     return result
 
 
-def poll_once(offset: Optional[int] = None) -> Dict[str, Any]:
-    updates_result = get_updates(offset=offset, timeout=1)
+def poll_once(offset: Optional[int] = None, long_poll_timeout: int = 1) -> Dict[str, Any]:
+    updates_result = get_updates(offset=offset, timeout=long_poll_timeout)
 
     if not updates_result.get("success"):
         return updates_result
 
     updates = updates_result.get("result", [])
     results = []
+    log_entries = []
+    outbox = []
     new_offset = offset
 
     for update in updates:
@@ -230,11 +308,16 @@ def poll_once(offset: Optional[int] = None) -> Dict[str, Any]:
         new_offset = update_id + 1
 
         if "message" in update:
-            result = process_message(update["message"])
-            results.append(result)
+            result = process_message(update["message"], log_entries, outbox)
         elif "callback_query" in update:
             result = process_callback_query(update["callback_query"])
-            results.append(result)
+        else:
+            continue
+        result["update_id"] = update_id
+        results.append(result)
+
+    log_messages(log_entries)
+    _send_replies(outbox)
 
     return {
         "success": True,
@@ -244,31 +327,38 @@ def poll_once(offset: Optional[int] = None) -> Dict[str, Any]:
     }
 
 
-def poll_continuous(check_interval: float = 1.0):
+def poll_continuous(check_interval: float = 1.0, long_poll_timeout: int = 30):
     config = load_config()
     interval = config.get("telegram", {}).get("polling_interval", check_interval)
 
-    print(f"Starting Telegram bot polling (interval: {interval}s)")
+    print(f"Starting Telegram bot polling (long poll: {long_poll_timeout}s)")
     print("Press Ctrl+C to stop")
 
     offset = None
 
     try:
         while True:
-            result = poll_once(offset)
+            # getUpdates blocks server-side until updates arrive or the timeout
+            # expires, so there is no sleep between successful polls.
+            result = poll_once(offset, long_poll_timeout=long_poll_timeout)
 
             if result.get("success"):
                 offset = result.get("new_offset", offset)
+                results = result.get("results", [])
 
-                for msg_result in result.get("results", []):
+                # Wall-clock time is display-only; format it once per batch
+                stamp = datetime.now().strftime("%H:%M:%S") if results else ""
+
+                for msg_result in results:
                     if msg_result.get("processed"):
                         print(
-                            f"[{datetime.now().strftime('%H:%M:%S')}] "
+                            f"[{stamp}] "
                             f"@{msg_result.get('username', 'unknown')}: "
                             f"{msg_result.get('text', msg_result.get('data', ''))[:50]}"
                         )
-
-            time.sleep(interval)
+            else:
+                # Back off on transport/API errors instead of hammering the API
+                time.sleep(interval)
 
     except KeyboardInterrupt:
         print("\nStopping bot...")
@@ -291,7 +381,7 @@ def main():
     parser.add_argument("--updates", action="store_true", help="Get recent updates without processing")
     parser.add_argument("--set-commands", action="store_true", help="Register bot commands")
     parser.add_argument("--offset", type=int, help="Update offset")
-    parser.add_argument("--interval", type=float, default=1.0, help="Polling interval in seconds")
+    parser.add_argument("--interval", type=float, default=1.0, help="Retry delay in seconds after a failed poll")
 
     args = parser.parse_args()
     result = None
@@ -22,12 +22,18 @@ Env Vars:
 import os
 import sys
 import json
+import atexit
 import argparse
+import functools
 import subprocess
 import time
 import re
+import queue
+import threading
 from pathlib import Path
 from datetime import datetime
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, Tuple
 from dotenv import load_dotenv
 
@@ -51,12 +57,13 @@ load_dotenv(PROJECT_ROOT / ".env")
 
 # Import sibling modules
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from telegram_send import send_message, send_typing_action
+from telegram_send import send_message, send_typing_action, edit_message_text
 from telegram_bot import (
-    poll_once, is_user_allowed, is_rate_limited,
+    poll_once, ack_updates, is_user_allowed, is_rate_limited,
     is_blocked_content, requires_confirmation, load_config,
 )
 from message_db import log_message, get_history, update_status
+import semantic_cache
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -65,22 +72,106 @@ from message_db import log_message, get_history, update_status
 MAX_RESPONSE_LENGTH = 4000  # Telegram message limit
 CLAUDE_TIMEOUT = 600  # 10 minutes
 PROGRESS_UPDATE_INTERVAL = 45  # Send progress update every N seconds
+TYPING_INTERVAL = 4  # Telegram's typing indicator expires after ~5s
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
 CONVERSATION_HISTORY_LIMIT = 20
+RESPONSE_CACHE_SIZE = 256  # Exact-match response cache entries
+RESPONSE_CACHE_TTL = 15 * 60  # seconds; short, since answers aren't tied to a turn
+MIN_CACHEABLE_WORDS = 4  # Shorter messages ("yes", "do it again") lean on the previous turn
+MEMORY_CACHE_SIZE = 64  # Recent memory-search results kept
+MEMORY_CACHE_TTL = 600  # seconds
+LONG_POLL_TIMEOUT = 30  # getUpdates holds the request open up to N seconds
+POLL_ERROR_BACKOFF = 5  # Wait at least N seconds after a failed poll (telegram.polling_interval may raise it)
+
+
+class _TTLCache:
+    """Small LRU cache whose entries also expire after ttl seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry and time.time() - entry[1] < self.ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        if entry:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._entries[key] = (value, time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# Exact-match response cache: (chat_id, normalized text) -> response
+_response_cache = _TTLCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+
+# Recent memory searches: normalized message -> formatted memory context
+_memory_cache = _TTLCache(MEMORY_CACHE_SIZE, MEMORY_CACHE_TTL)
+
+# Acknowledgements and greetings that never need a memory lookup
+_TRIVIAL_MESSAGE_RE = re.compile(
+    r"^\s*(ok(ay)?|k|thanks?|thank you|thx|ty|yes|no|yep|nope|sure|cool|great|nice|"
+    r"got it|sounds good|perfect|hi|hello|hey|bye|good (morning|night))[\s.!]*$",
+    re.IGNORECASE,
+)
+
+
+def _needs_memory(user_message: str) -> bool:
+    if _TRIVIAL_MESSAGE_RE.match(user_message):
+        return False
+    # Very short non-questions ("on it", "do it") carry nothing worth searching for
+    return len(user_message.split()) >= 3 or "?" in user_message
 
 
 # ---------------------------------------------------------------------------
 # Memory integration (mem0 + Pinecone)
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=1)
+def _load_smart_search():
+    """Import the memory skill's search function once per process."""
+    if str(MEMORY_SCRIPTS) not in sys.path:
+        sys.path.insert(0, str(MEMORY_SCRIPTS))
+    from smart_search import smart_search
+    return smart_search
+
+
+@functools.lru_cache(maxsize=1)
+def _load_add_memory():
+    """Import the memory skill's capture function once per process."""
+    if str(MEMORY_SCRIPTS) not in sys.path:
+        sys.path.insert(0, str(MEMORY_SCRIPTS))
+    from mem0_add import add_memory
+    return add_memory
+
+
 def get_memory_context(user_message: str) -> str:
     """
     Search mem0/Pinecone for memories relevant to the user's message.
-    This is the auto-load feature: every Telegram message triggers a semantic search.
+    This is the auto-load feature: every substantive Telegram message triggers a
+    semantic search; acknowledgements and greetings skip it.
     """
-    try:
-        sys.path.insert(0, str(MEMORY_SCRIPTS))
-        from smart_search import smart_search
+    if not _needs_memory(user_message):
+        return ""
+
+    cache_key = " ".join(user_message.lower().split())
+    cached = _memory_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
+    try:
+        smart_search = _load_smart_search()
         results = smart_search(user_message, limit=5)
 
         memories = []
@@ -97,10 +188,13 @@ def get_memory_context(user_message: str) -> str:
                         memories.append(mem)
 
         if not memories:
+            _memory_cache.put(cache_key, "")
             return ""
 
         formatted = "\n".join(f"- {m}" for m in memories)
-        return f"<persistent_memory>\nRelevant memories about this user:\n{formatted}\n</persistent_memory>\n\n"
+        context = f"<persistent_memory>\nRelevant memories about this user:\n{formatted}\n</persistent_memory>\n\n"
+        _memory_cache.put(cache_key, context)
+        return context
 
     except Exception as e:
         print(f"Warning: Memory search failed: {e}")
@@ -113,8 +207,7 @@ def capture_to_memory(user_msg: str, assistant_msg: str):
     Closes the loop: Telegram → Pinecone → future Telegram context.
     """
     try:
-        sys.path.insert(0, str(MEMORY_SCRIPTS))
-        from mem0_add import add_memory
+        add_memory = _load_add_memory()
 
         messages = [
             {"role": "user", "content": user_msg},
@@ -129,6 +222,17 @@ def capture_to_memory(user_msg: str, assistant_msg: str):
 # Conversation context from message history
 # ---------------------------------------------------------------------------
 
+def _format_history_line(msg: Dict[str, Any]) -> str:
+    content = msg.get("content", "")[:1000]
+    timestamp = msg.get("created_at", "")[:16]
+
+    if msg.get("direction", "") == "inbound":
+        return f"[{timestamp}] User: {content}"
+    if len(content) > 800:
+        content = content[:800] + "..."
+    return f"[{timestamp}] Assistant: {content}"
+
+
 def get_conversation_context(chat_id: str, limit: int = CONVERSATION_HISTORY_LIMIT) -> str:
     try:
         history = get_history(chat_id=chat_id, platform="telegram", limit=limit)
@@ -137,29 +241,42 @@ def get_conversation_context(chat_id: str, limit: int = CONVERSATION_HISTORY_LIM
         if not messages:
             return ""
 
-        messages = list(reversed(messages))
+        # History comes back newest-first; render it oldest-first in one join
+        body = "\n".join(_format_history_line(msg) for msg in reversed(messages))
+        return (
+            "<conversation_history>\nPrevious messages in this conversation:\n\n"
+            f"{body}\n"
+            "</conversation_history>\n\nCurrent request from user:"
+        )
+
+    except Exception as e:
+        print(f"Warning: Could not load conversation history: {e}")
+        return ""
 
-        lines = ["<conversation_history>", "Previous messages in this conversation:", ""]
 
-        for msg in messages:
-            direction = msg.get("direction", "")
-            content = msg.get("content", "")[:1000]
-            timestamp = msg.get("created_at", "")[:16]
+# Memory search (Pinecone + OpenAI) and the query embedding run here while
+# history is read from the local SQLite database on the calling thread.
+_context_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="context")
 
-            if direction == "inbound":
-                lines.append(f"[{timestamp}] User: {content}")
-            else:
-                lines.append(f"[{timestamp}] Assistant: {content[:800]}{'...' if len(content) > 800 else ''}")
 
-        lines.append("</conversation_history>")
-        lines.append("")
-        lines.append("Current request from user:")
+# Words that point back at earlier turns ("what does it return?", "explain that again")
+_CONTEXT_REFERENCE_RE = re.compile(
+    r"\b(it|its|this|that|these|those|they|them|their|above|previous|earlier|again|same)\b",
+    re.IGNORECASE,
+)
 
-        return "\n".join(lines)
 
-    except Exception as e:
-        print(f"Warning: Could not load conversation history: {e}")
-        return ""
+def _is_cacheable(text: str) -> bool:
+    """
+    Only standalone questions may be answered from cache: cached answers are not
+    tied to a conversation turn, so anything that leans on the previous one
+    (acks, short replies, back-references) always reaches Claude.
+    """
+    if _TRIVIAL_MESSAGE_RE.match(text) or len(text.split()) < MIN_CACHEABLE_WORDS:
+        return False
+    if _CONTEXT_REFERENCE_RE.search(text):
+        return False
+    return semantic_cache.is_cacheable(text)
 
 
 # ---------------------------------------------------------------------------
@@ -172,24 +289,157 @@ def _clean_env():
     env.pop("CLAUDECODE", None)
     return env
 
+_claude_cmd: Optional[str] = None
+
+
 def find_claude_cli() -> Optional[str]:
+    """Resolve the Claude CLI once; a miss is retried so a later install is picked up."""
+    global _claude_cmd
+    if _claude_cmd:
+        return _claude_cmd
+
     try:
         result = subprocess.run(["which", "claude"], capture_output=True, text=True, timeout=5)
         if result.returncode == 0:
-            return result.stdout.strip()
+            _claude_cmd = result.stdout.strip()
+            return _claude_cmd
     except Exception:
         pass
 
     try:
         result = subprocess.run(["which", "npx"], capture_output=True, text=True, timeout=5)
         if result.returncode == 0:
-            return "npx @anthropic-ai/claude-code"
+            _claude_cmd = "npx @anthropic-ai/claude-code"
+            return _claude_cmd
     except Exception:
         pass
 
     return None
 
 
+def _start_line_reader(stream) -> "queue.Queue[Optional[str]]":
+    """Read lines from stream on a daemon thread; None is queued at EOF."""
+    lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    def _drain():
+        for line in iter(stream.readline, ""):
+            lines.put(line)
+        lines.put(None)
+
+    threading.Thread(target=_drain, daemon=True).start()
+    return lines
+
+
+def _start_typing_heartbeat(chat_id: int, interval: float = TYPING_INTERVAL) -> threading.Event:
+    """Keep the typing indicator visible until the returned event is set."""
+    stop = threading.Event()
+
+    def _beat():
+        while True:
+            send_typing_action(chat_id)
+            if stop.wait(interval):
+                return
+
+    threading.Thread(target=_beat, daemon=True).start()
+    return stop
+
+
+# Progress sends run here so the stream-parsing loop never waits on Telegram.
+# One worker keeps each chat's send/edit calls in order.
+_progress_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="progress")
+
+
+def _post_progress(chat_id: int, progress: Dict[str, Any], text: str):
+    """Send the progress message once, then edit it in place."""
+    message_id = progress.get("message_id")
+    if message_id is not None and edit_message_text(chat_id, message_id, text).get("success"):
+        return
+    progress["message_id"] = send_message(chat_id, text).get("message_id")
+
+
+# Pre-warmed Claude process (daemon mode only). Node start-up and CLI config
+# load happen while idle; the next message just writes its prompt to stdin.
+_warm_lock = threading.Lock()
+_warm_process: Optional[subprocess.Popen] = None
+_prewarm_enabled = False
+
+
+def _spawn_claude_stream(claude_cmd: str) -> subprocess.Popen:
+    base = claude_cmd.split() if claude_cmd.startswith("npx") else [claude_cmd]
+    return subprocess.Popen(
+        base + [
+            "-p",
+            "--dangerously-skip-permissions",
+            "--input-format", "stream-json",
+            "--output-format", "stream-json",
+            "--verbose",
+        ],
+        cwd=str(PROJECT_ROOT),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+        env=_clean_env(),
+    )
+
+
+def _prewarm_claude(claude_cmd: str):
+    global _warm_process
+    process = _spawn_claude_stream(claude_cmd)
+    with _warm_lock:
+        stale, _warm_process = _warm_process, process
+    if stale is not None:
+        stale.kill()
+
+
+def _discard_warm_process():
+    global _warm_process
+    with _warm_lock:
+        stale, _warm_process = _warm_process, None
+    if stale is not None:
+        stale.kill()
+
+
+def enable_prewarm() -> bool:
+    """Keep one idle Claude process ready for the next message."""
+    global _prewarm_enabled
+    claude_cmd = find_claude_cli()
+    if not claude_cmd:
+        return False
+    _prewarm_enabled = True
+    atexit.register(_discard_warm_process)
+    _prewarm_claude(claude_cmd)
+    return True
+
+
+def _acquire_claude_process(claude_cmd: str) -> subprocess.Popen:
+    """Take the warm process if it is still alive, else spawn one."""
+    global _warm_process
+    with _warm_lock:
+        process, _warm_process = _warm_process, None
+
+    if process is None or process.poll() is not None:
+        process = _spawn_claude_stream(claude_cmd)
+
+    return process
+
+
+def _release_claude_process(claude_cmd: str, process: Optional[subprocess.Popen]):
+    """
+    Reap the finished process, then start the next spare. Spawning only now
+    keeps a single Claude process running per job, and the spare loads
+    CLAUDE.md and settings after this job may have changed them.
+    """
+    if process is not None:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+    if _prewarm_enabled:
+        threading.Thread(target=_prewarm_claude, args=(claude_cmd,), daemon=True).start()
+
+
 def invoke_claude_streaming(
     prompt: str,
     chat_id: int,
@@ -201,53 +451,46 @@ def invoke_claude_streaming(
     if not claude_cmd:
         return False, "Claude Code CLI not found. Install with: npm install -g @anthropic-ai/claude-code"
 
-    if claude_cmd.startswith("npx"):
-        cmd = claude_cmd.split() + [
-            "-p", prompt,
-            "--dangerously-skip-permissions",
-            "--output-format", "stream-json",
-            "--verbose",
-        ]
-    else:
-        cmd = [
-            claude_cmd,
-            "-p", prompt,
-            "--dangerously-skip-permissions",
-            "--output-format", "stream-json",
-            "--verbose",
-        ]
+    stop_typing = _start_typing_heartbeat(chat_id)
+    progress_future = None
+    process = None
 
     try:
-        process = subprocess.Popen(
-            cmd,
-            cwd=str(PROJECT_ROOT),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            env=_clean_env(),
-        )
+        # The prompt goes over stdin as one stream-json user message; closing
+        # stdin ends the session after its result, so nothing carries over.
+        process = _acquire_claude_process(claude_cmd)
+        process.stdin.write(json.dumps({
+            "type": "user",
+            "message": {"role": "user", "content": prompt},
+        }) + "\n")
+        process.stdin.close()
 
         output_text = ""
+        progress: Dict[str, Any] = {}
         last_update_time = time.time()
         last_tool = None
         tool_count = 0
         current_activity = "Starting..."
         start_time = time.time()
 
+        # A reader thread drains stdout so the loop below wakes on each line
+        # (or once a second to send progress) without polling the pipe.
+        lines = _start_line_reader(process.stdout)
+
         while True:
             if time.time() - start_time > timeout:
                 process.kill()
                 return False, f"Request timed out after {timeout} seconds. Try a simpler request."
 
-            import select
-            ready, _, _ = select.select([process.stdout], [], [], 1.0)
-
-            if ready:
-                line = process.stdout.readline()
-                if not line:
+            try:
+                line = lines.get(timeout=1.0)
+            except queue.Empty:
+                line = ""
+            else:
+                if line is None:  # EOF: Claude closed stdout
                     break
 
+            if line:
                 line = line.strip()
                 if not line:
                     continue
@@ -290,11 +533,9 @@ def invoke_claude_streaming(
                 except json.JSONDecodeError:
                     output_text += line + "\n"
 
-            # Periodic progress updates to Telegram
+            # Periodic progress updates to Telegram: one message, edited in place
             elapsed = time.time() - last_update_time
             if elapsed >= update_interval:
-                send_typing_action(chat_id)
-
                 progress_msg = f"Still working...\n\n"
                 progress_msg += f"Time: {int(time.time() - start_time)}s\n"
                 if tool_count > 0:
@@ -302,24 +543,14 @@ def invoke_claude_streaming(
                 if current_activity:
                     progress_msg += f"Current: {current_activity}"
 
-                send_message(chat_id, progress_msg)
+                progress_future = _progress_executor.submit(_post_progress, chat_id, progress, progress_msg)
                 last_update_time = time.time()
 
-            if process.poll() is not None:
-                break
-
-        remaining_stdout, _ = process.communicate(timeout=5)
-        if remaining_stdout:
-            for line in remaining_stdout.strip().split("\n"):
-                if line:
-                    try:
-                        event = json.loads(line)
-                        if event.get("type") == "result":
-                            output_text = event.get("result", output_text)
-                    except json.JSONDecodeError:
-                        output_text += line
-
-        output_text = re.sub(r"\x1b\[[0-9;]*m", "", output_text)
+        # stdout is fully drained by the reader; drain stderr and reap the process
+        process.stderr.read()
+        process.wait(timeout=5)
+
+        output_text = _ANSI_RE.sub("", output_text)
         output_text = output_text.strip()
 
         if not output_text:
@@ -329,6 +560,15 @@ def invoke_claude_streaming(
 
     except Exception as e:
         return False, f"Error invoking Claude: {str(e)}"
+    finally:
+        stop_typing.set()
+        _release_claude_process(claude_cmd, process)
+        if progress_future is not None:
+            # Drop an update that hasn't started, then wait out one in flight
+            # (single worker, so the no-op runs last) so no "Still working..."
+            # can land below the final answer.
+            progress_future.cancel()
+            _progress_executor.submit(lambda: None).result()
 
 
 def invoke_claude(prompt: str, timeout: int = CLAUDE_TIMEOUT) -> Tuple[bool, str]:
@@ -356,7 +596,7 @@ def invoke_claude(prompt: str, timeout: int = CLAUDE_TIMEOUT) -> Tuple[bool, str
         if result.stderr and "error" in result.stderr.lower():
             output += f"\n\nErrors:\n{result.stderr}"
 
-        output = re.sub(r"\x1b\[[0-9;]*m", "", output).strip()
+        output = _ANSI_RE.sub("", output).strip()
 
         if not output:
             output = "(No output from Claude)"
@@ -377,26 +617,27 @@ def truncate_response(text: str, max_length: int = MAX_RESPONSE_LENGTH) -> str:
     if len(text) <= max_length:
         return text
 
-    truncated = text[:max_length - 100]
-    last_newline = truncated.rfind("\n")
-    if last_newline > max_length - 500:
-        truncated = truncated[:last_newline]
+    # Cut at a newline only if one falls in the last ~400 chars; search just that window
+    cut = max_length - 100
+    last_newline = text.rfind("\n", max(0, max_length - 499), cut)
+    if last_newline != -1:
+        cut = last_newline
 
-    return truncated + "\n\n... (response truncated)"
+    return f"{text[:cut]}\n\n... (response truncated)"
 
 
-def format_response(success: bool, response: str, execution_time: float) -> str:
+def format_response(success: bool, response: str, execution_time: float, cached: bool = False) -> str:
     time_str = f"{execution_time:.1f}s" if execution_time < 60 else f"{execution_time/60:.1f}m"
 
-    if success:
+    if cached:
+        footer = f"\n\n---\n(from cache) Answered in {time_str}"
+    elif success:
         footer = f"\n\n---\nCompleted in {time_str}"
     else:
         footer = f"\n\n---\nFailed after {time_str}"
 
     max_content = MAX_RESPONSE_LENGTH - len(footer) - 10
-    content = truncate_response(response, max_content)
-
-    return content + footer
+    return f"{truncate_response(response, max_content)}{footer}"
 
 
 # ---------------------------------------------------------------------------
@@ -421,9 +662,8 @@ def handle_message(message: Dict[str, Any], dry_run: bool = False) -> Dict[str,
         result["success"] = True
         return result
 
-    # Acknowledge receipt
+    # Acknowledge receipt; the typing heartbeat takes over once Claude starts
     send_message(chat_id, "Got it! Working on your request...")
-    send_typing_action(chat_id)
 
     # Log incoming request
     db_result = log_message(
@@ -437,38 +677,74 @@ def handle_message(message: Dict[str, Any], dry_run: bool = False) -> Dict[str,
 
     print(f"[{datetime.now().strftime('%H:%M:%S')}] Processing @{username}: {text[:50]}...")
 
-    # Build prompt with memory + conversation context
-    memory_context = get_memory_context(text)
-    conversation_context = get_conversation_context(str(chat_id))
-
-    context_parts = []
-    if memory_context:
-        context_parts.append(memory_context)
-    if conversation_context:
-        context_parts.append(conversation_context)
-
-    full_prompt = "".join(context_parts) + text if context_parts else text
-
-    if memory_context:
-        print(f"  Memory context loaded ({memory_context.count(chr(10))} lines)")
-
     start_time = time.time()
 
-    # Invoke Claude with streaming + progress updates
-    success, response = invoke_claude_streaming(
-        full_prompt,
-        chat_id=chat_id,
-        timeout=CLAUDE_TIMEOUT,
-        update_interval=PROGRESS_UPDATE_INTERVAL,
-    )
+    # Repeat of a recent standalone question in this chat? Try the exact-match
+    # cache first, then the semantic cache, before running Claude.
+    cached = None
+    query_embedding = None
+    cacheable = _is_cacheable(text)
+    cache_key = (str(chat_id), " ".join(text.lower().split()))
+
+    if cacheable:
+        exact = _response_cache.get(cache_key)
+        print(f"  Response cache: {_response_cache.hits} hits / {_response_cache.misses} misses")
+        if exact is not None:
+            cached = {"response": exact, "similarity": 1.0}
+
+    if not cached:
+        # Memory search and the query embedding start now; the history read
+        # below overlaps with both
+        memory_future = _context_executor.submit(get_memory_context, text)
+        embedding_future = _context_executor.submit(semantic_cache.embed, text) if cacheable else None
+        conversation_context = get_conversation_context(str(chat_id))
+
+        if embedding_future is not None:
+            query_embedding = embedding_future.result()
+            if query_embedding:
+                cached = semantic_cache.lookup(str(chat_id), query_embedding)
+                if cached:
+                    _response_cache.put(cache_key, cached["response"])
+
+    if cached:
+        success, response = True, cached["response"]
+        print(f"  Cache hit (similarity {cached['similarity']:.2f})")
+    else:
+        # Build prompt with memory + conversation context
+        memory_context = memory_future.result()
+
+        context_parts = []
+        if memory_context:
+            context_parts.append(memory_context)
+        if conversation_context:
+            context_parts.append(conversation_context)
+
+        full_prompt = "".join(context_parts) + text if context_parts else text
+
+        if memory_context:
+            print(f"  Memory context loaded ({memory_context.count(chr(10))} lines)")
+
+        # Invoke Claude with streaming + progress updates
+        success, response = invoke_claude_streaming(
+            full_prompt,
+            chat_id=chat_id,
+            timeout=CLAUDE_TIMEOUT,
+            update_interval=PROGRESS_UPDATE_INTERVAL,
+        )
+
+        if success and cacheable:
+            _response_cache.put(cache_key, response)
+            if query_embedding:
+                semantic_cache.store(str(chat_id), text, query_embedding, response)
 
     execution_time = time.time() - start_time
 
     # Format and send response
-    formatted = format_response(success, response, execution_time)
+    formatted = format_response(success, response, execution_time, cached=bool(cached))
     send_result = send_message(chat_id, formatted)
 
-    # Log outbound response
+    # Log outbound response. Written before returning so the next message's
+    # history already includes this answer.
     log_message(
         platform="telegram",
         direction="outbound",
@@ -480,12 +756,15 @@ def handle_message(message: Dict[str, Any], dry_run: bool = False) -> Dict[str,
     if inbound_msg_id:
         update_status(inbound_msg_id, "processed" if success else "failed")
 
-    # Capture conversation into mem0 (async-safe — failures don't block response)
-    capture_to_memory(text, response)
+    # Capture conversation into mem0 off the hot path (failures don't block response).
+    # Cached answers were captured when first generated.
+    if not cached:
+        _post_response_executor.submit(_run_quietly, capture_to_memory, text, response)
 
     result["success"] = success
     result["response"] = response[:500] + "..." if len(response) > 500 else response
     result["execution_time"] = execution_time
+    result["cached"] = bool(cached)
     result["sent"] = send_result.get("success", False)
 
     print(f"[{datetime.now().strftime('%H:%M:%S')}] Response sent ({execution_time:.1f}s)")
@@ -493,34 +772,82 @@ def handle_message(message: Dict[str, Any], dry_run: bool = False) -> Dict[str,
     return result
 
 
+# mem0 capture after the reply is sent (mem0 + OpenAI + Pinecone, often
+# seconds) runs here, so the polling loop can pick up the next message right away.
+_post_response_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="post-response")
+
+
+def _run_quietly(fn, *args, **kwargs):
+    try:
+        fn(*args, **kwargs)
+    except Exception as e:
+        print(f"Warning: {getattr(fn, '__name__', 'task')} failed: {e}")
+
+
 # ---------------------------------------------------------------------------
 # Polling loop
 # ---------------------------------------------------------------------------
 
-def process_updates(once: bool = False, dry_run: bool = False) -> Dict[str, Any]:
-    config = load_config()
-    interval = config.get("telegram", {}).get("polling_interval", 2.0)
+# Update ids already handed to Claude. A redelivered update (e.g. after a failed
+# offset confirm) would otherwise repeat a run that can take minutes.
+SEEN_UPDATES_LIMIT = 512
+_seen_update_order: "deque[int]" = deque(maxlen=SEEN_UPDATES_LIMIT)
+_seen_update_ids = set()
 
+
+def _mark_update_seen(update_id: Optional[int]) -> bool:
+    """Record update_id; False if it was already handled."""
+    if update_id is None:
+        return True
+    if update_id in _seen_update_ids:
+        return False
+    if len(_seen_update_order) == _seen_update_order.maxlen:
+        _seen_update_ids.discard(_seen_update_order[0])
+    _seen_update_order.append(update_id)
+    _seen_update_ids.add(update_id)
+    return True
+
+
+def process_updates(once: bool = False, dry_run: bool = False) -> Dict[str, Any]:
     print(f"Starting Telegram handler")
     print(f"  Project root: {PROJECT_ROOT}")
-    print(f"  Polling interval: {interval}s")
+    print(f"  Long poll: {LONG_POLL_TIMEOUT}s")
+    if not once and not dry_run:
+        prewarmed = enable_prewarm()
+        print(f"  Pre-warmed Claude: {'yes' if prewarmed else 'no (CLI not found)'}")
     print(f"  Memory: mem0 + Pinecone (auto-load + auto-capture)")
     print(f"  Dry run: {dry_run}")
     print("Press Ctrl+C to stop\n")
 
+    configured_delay = load_config().get("telegram", {}).get("polling_interval", POLL_ERROR_BACKOFF)
+    retry_delay = max(POLL_ERROR_BACKOFF, configured_delay)
+
     offset = None
     total_processed = 0
     results = []
 
     try:
         while True:
-            poll_result = poll_once(offset)
+            # Daemon mode long-polls: the request blocks until updates arrive,
+            # so there is no sleep between polls. --once just checks and exits.
+            poll_result = poll_once(offset, long_poll_timeout=1 if once else LONG_POLL_TIMEOUT)
 
             if poll_result.get("success"):
                 offset = poll_result.get("new_offset", offset)
 
                 for msg_result in poll_result.get("results", []):
                     if msg_result.get("processed") and msg_result.get("text"):
+                        update_id = msg_result.get("update_id")
+                        if not _mark_update_seen(update_id):
+                            print(f"  Skipping duplicate update {update_id}")
+                            continue
+
+                        # Confirm this update with Telegram before the long
+                        # Claude run, so a crash or restart can't replay it.
+                        # A dry run leaves it pending for the next real run.
+                        if update_id is not None and not dry_run:
+                            ack_updates(update_id + 1)
+
                         handle_result = handle_message(msg_result, dry_run=dry_run)
                         results.append(handle_result)
                         total_processed += 1
@@ -535,8 +862,9 @@ def process_updates(once: bool = False, dry_run: bool = False) -> Dict[str, Any]
             if once and total_processed == 0:
                 return {"success": True, "processed": 0, "message": "No pending messages"}
 
-            if not once:
-                time.sleep(interval)
+            if not poll_result.get("success"):
+                print(f"Warning: Poll failed: {poll_result.get('error')}")
+                time.sleep(retry_delay)
 
     except KeyboardInterrupt:
         print("\nStopping handler...")
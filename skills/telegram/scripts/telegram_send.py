@@ -13,14 +13,25 @@ Env Vars:
 import os
 import sys
 import json
+import queue
+import atexit
 import argparse
+import functools
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # ---------------------------------------------------------------------------
 # Paths — resolve relative to project root, not script location
 # ---------------------------------------------------------------------------
@@ -42,14 +53,44 @@ LOG_DIR = PROJECT_ROOT / "logs"
 
 TELEGRAM_API_BASE = "https://api.telegram.org/bot{token}/{method}"
 
+# One pooled session for the process: keep-alive sockets to api.telegram.org are
+# reused across getUpdates/sendMessage calls instead of a new TLS handshake each time.
+# Every Bot API call is a POST and sendMessage/sendDocument are not idempotent,
+# so only failures where Telegram cannot have acted are retried: connection
+# errors and 429 rate limits. Read timeouts and 5xx are not retried, since the
+# message may already have been delivered.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            read=0,
+            other=0,
+            backoff_factor=0.3,
+            status_forcelist=[429],
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        ),
+    ),
+)
+
 
 def load_config() -> Dict[str, Any]:
     if CONFIG_PATH.exists():
-        with open(CONFIG_PATH) as f:
-            return yaml.safe_load(f)
+        return _load_config(CONFIG_PATH.stat().st_mtime)
     return {}
 
 
+@functools.lru_cache(maxsize=1)
+def _load_config(mtime: float) -> Dict[str, Any]:
+    # Keyed by mtime so edits to messaging.yaml are picked up without a restart
+    with open(CONFIG_PATH) as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 def get_bot_token() -> str:
     token = os.getenv("TELEGRAM_BOT_TOKEN")
     if not token:
@@ -57,15 +98,17 @@ def get_bot_token() -> str:
     return token
 
 
-def telegram_api_call(method: str, data: Dict = None, files: Dict = None) -> Dict[str, Any]:
+def telegram_api_call(
+    method: str, data: Dict = None, files: Dict = None, timeout: float = 30
+) -> Dict[str, Any]:
     token = get_bot_token()
     url = TELEGRAM_API_BASE.format(token=token, method=method)
 
     try:
         if files:
-            response = requests.post(url, data=data, files=files, timeout=30)
+            response = _SESSION.post(url, data=data, files=files, timeout=timeout)
         else:
-            response = requests.post(url, json=data, timeout=30)
+            response = _SESSION.post(url, json=data, timeout=timeout)
 
         result = response.json()
 
@@ -121,6 +164,24 @@ def send_message(
     return result
 
 
+def edit_message_text(
+    chat_id: int, message_id: int, text: str, parse_mode: Optional[str] = None
+) -> Dict[str, Any]:
+    data = {"chat_id": chat_id, "message_id": message_id, "text": text}
+
+    if parse_mode:
+        data["parse_mode"] = (
+            parse_mode.upper() if parse_mode.lower() in ["markdown", "html"] else None
+        )
+
+    result = telegram_api_call("editMessageText", data)
+
+    if result.get("success"):
+        return {"success": True, "message_id": message_id, "chat_id": chat_id}
+
+    return result
+
+
 def send_document(
     chat_id: int, file_path: str, caption: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -198,18 +259,72 @@ def get_me() -> Dict[str, Any]:
 
 
 def log_message(chat_id: int, direction: str, text: str):
+    log_messages([(chat_id, direction, text)])
+
+
+def log_messages(entries: List[Tuple[int, str, str]]):
+    """Queue (chat_id, direction, text) entries for the message log as one write."""
+    if not entries:
+        return
+
     config = load_config()
     if not config.get("logging", {}).get("enabled", True):
         return
 
+    timestamp = datetime.now().isoformat()
+    log_entries = "".join(
+        f"{timestamp} | {direction} | chat:{chat_id} | {text[:200]}\n"
+        for chat_id, direction, text in entries
+    )
+
+    _start_log_writer()
+    _LOG_QUEUE.put(log_entries)
+
+
+# Log lines are appended by one background thread that keeps messaging.log open,
+# so the send path never pays for an open/write/close per message.
+_LOG_QUEUE: "queue.Queue[Optional[str]]" = queue.Queue()
+_log_writer: Optional[threading.Thread] = None
+_log_writer_lock = threading.Lock()
+
+
+def _log_writer_loop():
     LOG_DIR.mkdir(parents=True, exist_ok=True)
-    log_file = LOG_DIR / "messaging.log"
+    with open(LOG_DIR / "messaging.log", "a") as f:
+        while True:
+            chunk = _LOG_QUEUE.get()
+            # Drain whatever else is queued so a burst becomes one write + flush
+            chunks = [chunk]
+            while chunk is not None:
+                try:
+                    chunk = _LOG_QUEUE.get_nowait()
+                except queue.Empty:
+                    break
+                chunks.append(chunk)
+            f.write("".join(c for c in chunks if c is not None))
+            f.flush()
+            if chunks[-1] is None:
+                return
+
+
+def _start_log_writer():
+    global _log_writer
+    if _log_writer is not None:
+        return
+    with _log_writer_lock:
+        if _log_writer is None:
+            _log_writer = threading.Thread(target=_log_writer_loop, name="messaging-log", daemon=True)
+            _log_writer.start()
+
+
+def _stop_log_writer():
+    """Flush queued log lines before the interpreter exits."""
+    if _log_writer is not None and _log_writer.is_alive():
+        _LOG_QUEUE.put(None)
+        _log_writer.join(timeout=5)
 
-    timestamp = datetime.now().isoformat()
-    log_entry = f"{timestamp} | {direction} | chat:{chat_id} | {text[:200]}\n"
 
-    with open(log_file, "a") as f:
-        f.write(log_entry)
+atexit.register(_stop_log_writer)
 
 
 def main():